@@ -1,33 +1,249 @@
-import requests
-from bs4 import BeautifulSoup
-import time
-import pandas as pd
+import asyncio
+import aiohttp
+from concurrent.futures import ProcessPoolExecutor
+import lxml.html
+from lxml.etree import XPath
+import csv
+import functools
+import itertools
 import re
-from urllib.parse import urljoin
+from collections import defaultdict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
 import os
+import sqlite3
+import uuid
 
-def get_page_no(url, company, page_no, next, year):
+URL_TMPL = "https://www.moneycontrol.com/stocks/company_info/stock_news.php?sc_id={sc}&scat=&page_no={p}&next={n}&durationType=Y&Year={y}&duration=1&news_type="
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Connection pool caps: the connector never opens more than this many sockets
+# overall, or to any single host
+MAX_CONNECTIONS = 64
+MAX_CONNECTIONS_PER_HOST = 8
+
+# Pipeline sizing: listing workers walk company/year listings and feed a bounded
+# queue that article workers drain; the per-host rate limiter, not the worker
+# count, is what keeps the load on the server polite
+LISTING_WORKERS = 4
+ARTICLE_WORKERS = MAX_CONNECTIONS_PER_HOST
+ARTICLE_QUEUE_SIZE = 256
+
+CSV_FIELDS = ['company', 'year', 'title', 'link', 'date', 'summary', 'full_article']
+
+# SQLite file remembering every article already extracted, so reruns resume instead
+# of starting over and an article listed on several pages is only fetched once
+CACHE_DB = 'moneycontrol_articles.sqlite3'
+CACHE_COMMIT_EVERY = 50
+
+REQUEST_TIMEOUT = 15
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRY_AFTER = 60
+
+# Article pages are cut off at this many bytes (far more HTML than the 15000-char
+# text cap ever needs) and skipped outright unless they are HTML
+MAX_ARTICLE_BYTES = 512_000
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+# full_article placeholders for articles that could not be fetched or parsed
+FETCH_ERROR = "Error: Could not fetch article content"
+PARSE_ERROR = "Error: Could not parse article content"
+
+# Article parsing is CPU bound, so it runs in worker processes instead of on the event loop
+PARSER_POOL = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+def _has_class(class_name):
+    """
+    XPath predicate matching elements whose class list contains class_name (CSS .class semantics)
+    """
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+# Listing page structure: pagination links, then one block per article with its link and date
+PAGINATION_XPATH = XPath("//div[normalize-space(@class)='pages MR10 MT15']")
+PAGE_LINK_XPATH = XPath(".//a")
+LISTING_XPATH = XPath("//div[normalize-space(@class)='FL PR20']")
+LISTING_LINK_XPATH = XPath(f".//a[{_has_class('arial11_summ')}]")
+LISTING_DATE_XPATH = XPath(f".//span[{_has_class('g_date')}]")
+
+# Every candidate article container in one union, so a single tree walk finds them all
+# (in document order); _container_rank then restores the selector priority
+ARTICLE_XPATH = XPath("//article | //div[contains(@class, 'article') or contains(@class, 'content')]")
+
+# Preferred container classes, best first; after these come <article>, then any div
+# whose class mentions "article", then any div whose class mentions "content"
+ARTICLE_CLASSES = ('article_scheme', 'article', 'content_text', 'article-content', 'story-content', 'article-body', 'content')
+TEXT_XPATH = XPath(".//p | .//h1 | .//h2 | .//h3 | .//h4 | .//h5 | .//h6")
+DROP_XPATH = XPath(".//script | .//style | .//nav | .//header | .//footer | .//aside")
+
+_WS_RE = re.compile(r'\s+')
+
+# Fallback when no article container matches: scrape the whole body
+BODY_TEXT_XPATH = XPath(".//p | .//h1 | .//h2 | .//h3 | .//h4 | .//h5 | .//h6 | .//div")
+BODY_DROP_XPATH = XPath(".//script | .//style | .//nav | .//header | .//footer | .//aside | .//form | .//button")
+
+class AsyncLimiter:
+    """
+    Token bucket allowing at most max_rate requests per time_period seconds
+    
+    Requests only wait when the bucket is empty, so a slow response does not
+    also cost a fixed sleep afterwards. Await acquire() or use `async with limiter:`.
+    The bucket always holds at least one token, so fractional rates such as 0.5
+    requests per second still work.
+    """
+    def __init__(self, max_rate, time_period=1):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self.capacity = max(1, max_rate)
+        self._tokens = self.capacity
+        self._updated = None
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        # Waiters queue on the lock, so tokens are handed out first come, first served
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                if self._updated is not None:
+                    refill = (now - self._updated) * self.max_rate / self.time_period
+                    self._tokens = min(self.capacity, self._tokens + refill)
+                self._updated = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.time_period / self.max_rate)
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+def host_limiters(requests_per_second):
+    """
+    Per-host AsyncLimiter registry; a limiter is created the first time a host is looked up
+    """
+    return defaultdict(lambda: AsyncLimiter(requests_per_second, 1))
+
+@functools.lru_cache(maxsize=None)
+def _html_parser(encoding):
+    """
+    lxml HTML parser decoding with the charset the server declared
+    
+    Bodies are always handed to lxml as bytes, so no charset detection runs in Python.
+    Without a usable declared charset this returns None and lxml falls back to the
+    page's own <meta charset>.
+    """
+    if not encoding:
+        return None
+    try:
+        return lxml.html.HTMLParser(encoding=encoding)
+    except LookupError:
+        return None
+
+def create_session():
+    """
+    Create an aiohttp session backed by a pooled, per-host limited connector
+    """
+    connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS, limit_per_host=MAX_CONNECTIONS_PER_HOST)
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers={'User-Agent': USER_AGENT},
+        timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    )
+
+def retry_delay(response, attempt):
+    """
+    Seconds to wait before retrying: the server's Retry-After if it asks for longer
+    than the exponential back-off, capped at MAX_RETRY_AFTER
+    """
+    backoff = RETRY_BACKOFF * 2 ** attempt
+    retry_after = response.headers.get('Retry-After')
+    if not retry_after:
+        return backoff
+    
+    try:
+        # Retry-After is either a number of seconds or an HTTP date
+        if retry_after.strip().isdigit():
+            seconds = int(retry_after)
+        else:
+            seconds = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+    except (TypeError, ValueError):
+        return backoff
+    return min(max(seconds, backoff), MAX_RETRY_AFTER)
+
+async def read_body(response, max_bytes=None, html_only=False):
+    """
+    Read a successful response as (raw body bytes, charset from the Content-Type header or None)
+    
+    With html_only, non-HTML responses return (None, None) without downloading the body;
+    max_bytes stops reading the body once that many bytes have arrived.
+    """
+    if html_only and response.content_type not in HTML_CONTENT_TYPES:
+        return None, None
+    if max_bytes is None:
+        return await response.read(), response.charset
+    
+    body = bytearray()
+    async for chunk in response.content.iter_chunked(64 * 1024):
+        body += chunk
+        if len(body) >= max_bytes:
+            break
+    return bytes(body[:max_bytes]), response.charset
+
+async def fetch(session, limiters, url, max_bytes=None, html_only=False):
+    """
+    GET a URL and return read_body()'s (body, charset), retrying transient server
+    errors, dropped connections and timeouts
+    
+    Every attempt first takes a token from the limiter of the URL's host.
+    """
+    limiter = limiters[urlsplit(url).netloc]
+    for attempt in range(MAX_RETRIES + 1):
+        await limiter.acquire()
+        try:
+            async with session.get(url) as response:
+                if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    response.raise_for_status()
+                    return await read_body(response, max_bytes, html_only)
+                delay = retry_delay(response, attempt)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt == MAX_RETRIES:
+                raise
+            delay = RETRY_BACKOFF * 2 ** attempt
+        
+        # Back off only after the response is released, so a throttled host
+        # does not also hold one of its pooled connections while we wait
+        await asyncio.sleep(delay)
+
+async def get_page_no(session, limiters, url, company, page_no, next, year):
     """
     Get the maximum page number and next value for pagination
     """
     try:
-        request = requests.get(url)
-        request.raise_for_status()
+        content, encoding = await fetch(session, limiters, url)
         
-        soup = BeautifulSoup(request.text, 'html.parser')
-        all_page_no = soup.find_all('div', attrs={'class': 'pages MR10 MT15'})
+        tree = lxml.html.fromstring(content, parser=_html_parser(encoding))
+        all_page_no = PAGINATION_XPATH(tree)
         
         # Check if pagination elements exist
         if not all_page_no:
             print(f"No pagination found for {company} in year {year}")
             return 1, next
         
-        # Check if the first element exists and has anchor tags
-        if not all_page_no[0] or not all_page_no[0].find_all('a'):
+        # Check if the first element has anchor tags
+        page_links = PAGE_LINK_XPATH(all_page_no[0])
+        if not page_links:
             print(f"No pagination links found for {company} in year {year}")
             return 1, next
         
-        page_list = [i.text for i in all_page_no[0].find_all('a')]
+        page_list = [i.text_content() for i in page_links]
         
         if not page_list:
             print(f"Empty page list for {company} in year {year}")
@@ -45,241 +261,468 @@ def get_page_no(url, company, page_no, next, year):
                 print(f"No numeric pages found for {company} in year {year}")
                 return 1, next
                 
-    except requests.RequestException as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         print(f"Request failed for {company} in year {year}: {e}")
         return 1, next
     except Exception as e:
         print(f"Error processing {company} in year {year}: {e}")
         return 1, next
 
-def extract_full_article(article_url):
+def _container_rank(element):
+    """
+    Priority of a candidate article container, lower is better
+    """
+    if element.tag == 'article':
+        return len(ARTICLE_CLASSES)
+    
+    css_class = element.get('class', '')
+    class_names = css_class.split()
+    for rank, class_name in enumerate(ARTICLE_CLASSES):
+        if class_name in class_names:
+            return rank
+    return len(ARTICLE_CLASSES) + (1 if 'article' in css_class else 2)
+
+def _parse_article_bytes(content, encoding=None):
+    """
+    Extract the cleaned article text from raw HTML bytes
+    
+    Kept at module level so it can run in PARSER_POOL worker processes.
+    """
+    tree = lxml.html.fromstring(content, parser=_html_parser(encoding))
+    
+    article_content = ""
+    
+    # Like the old one-selector-at-a-time lookup, only the first container of each rank
+    # (in document order) is tried, best rank first
+    containers = {}
+    for element in ARTICLE_XPATH(tree):
+        containers.setdefault(_container_rank(element), element)
+    
+    for rank in sorted(containers):
+        content_div = containers[rank]
+        # Remove script and style elements (drop_tree keeps the text that follows them)
+        for unwanted in DROP_XPATH(content_div):
+            unwanted.drop_tree()
+        
+        # Extract text content
+        paragraphs = [el.text_content().strip() for el in TEXT_XPATH(content_div)]
+        if paragraphs:
+            article_content = '\n\n'.join([p for p in paragraphs if p])
+            break
+    
+    # If no content found with selectors, try to extract from body
+    if not article_content:
+        body = tree.find('body')
+        if body is not None:
+            # Remove unwanted elements
+            for unwanted in BODY_DROP_XPATH(body):
+                unwanted.drop_tree()
+            
+            # Find all text content
+            text_elements = [el.text_content().strip() for el in BODY_TEXT_XPATH(body)]
+            article_content = '\n\n'.join([text for text in text_elements if len(text) > 50])
+    
+    # Clean up the content
+    if article_content:
+        # Remove extra whitespace and normalize
+        article_content = _WS_RE.sub(' ', article_content).strip()
+        
+        # Limit content length to avoid extremely long articles
+        if len(article_content) > 15000:
+            article_content = article_content[:15000] + "... [Content truncated]"
+    
+    return article_content
+
+async def extract_full_article(session, limiters, article_url):
     """
     Extract full article content from a given URL
     """
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+        content, encoding = await fetch(session, limiters, article_url, max_bytes=MAX_ARTICLE_BYTES, html_only=True)
         
-        response = requests.get(article_url, headers=headers, timeout=15)
-        response.raise_for_status()
+        # Skip PDFs, videos and other non-HTML links
+        if content is None:
+            print(f"Skipping non-HTML article {article_url}")
+            return ""
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # lxml refuses an empty document; there is simply no article text to extract
+        if not content.strip():
+            return ""
         
-        # Try different selectors for article content
-        article_selectors = [
-            'div.article_scheme',
-            'div.article',
-            'div.content_text',
-            'div.article-content',
-            'div.story-content',
-            'div.article-body',
-            'div.content',
-            'article',
-            'div[class*="article"]',
-            'div[class*="content"]'
-        ]
+        # Parse on another core so the event loop keeps pumping I/O meanwhile
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(PARSER_POOL, _parse_article_bytes, content, encoding)
         
-        article_content = ""
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Failed to fetch article {article_url}: {e}")
+        return FETCH_ERROR
+    except Exception as e:
+        print(f"Error processing article {article_url}: {e}")
+        return PARSE_ERROR
+
+async def get_listing_articles(session, limiters, url, company, year, page_no):
+    """
+    Fetch one listing page and return the article entries linked from it
+    """
+    try:
+        content, encoding = await fetch(session, limiters, url)
         
-        for selector in article_selectors:
-            content_div = soup.select_one(selector)
-            if content_div:
-                # Remove script and style elements
-                for script in content_div(["script", "style", "nav", "header", "footer", "aside"]):
-                    script.decompose()
-                
-                # Extract text content
-                paragraphs = content_div.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-                if paragraphs:
-                    article_content = '\n\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-                    break
+        # Only the article blocks are walked; the rest of the portal page is never touched from Python
+        tree = lxml.html.fromstring(content, parser=_html_parser(encoding))
+        articles = LISTING_XPATH(tree)
         
-        # If no content found with selectors, try to extract from body
-        if not article_content:
-            body = soup.find('body')
-            if body:
-                # Remove unwanted elements
-                for unwanted in body(["script", "style", "nav", "header", "footer", "aside", "form", "button"]):
-                    unwanted.decompose()
+        listing = []
+        for article in articles:
+            try:
+                link_elements = LISTING_LINK_XPATH(article)
+                if not link_elements:
+                    continue
+                link_element = link_elements[0]
+                
+                link = link_element.get('href', 'No link')
+                
+                # Skip if no valid link
+                if link == 'No link' or not link.startswith('http'):
+                    continue
                 
-                # Find all text content
-                text_elements = body.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'div'])
-                article_content = '\n\n'.join([elem.get_text(strip=True) for elem in text_elements if elem.get_text(strip=True) and len(elem.get_text(strip=True)) > 50])
+                # The title attribute (or link text) doubles as the summary
+                title = summary = link_element.get('title') or link_element.text_content().strip()
+                
+                # Extract date from the article block
+                date_elements = LISTING_DATE_XPATH(article)
+                if date_elements:
+                    date = date_elements[0].text_content().strip()
+                else:
+                    date = "No date"
+                
+                listing.append({
+                    'company': company,
+                    'year': year,
+                    'title': title,
+                    'link': link,
+                    'date': date,
+                    'summary': summary
+                })
+                
+            except Exception as e:
+                print(f"Error processing article for {company} in year {year}: {e}")
+                continue
         
-        # Clean up the content
-        if article_content:
-            # Remove extra whitespace and normalize
-            article_content = re.sub(r'\s+', ' ', article_content)
-            article_content = re.sub(r'\n\s*\n', '\n\n', article_content)
-            article_content = article_content.strip()
+        return listing
+        
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Request failed for {company} year {year} page {page_no}: {e}")
+        return []
+    except Exception as e:
+        print(f"Error processing {company} year {year} page {page_no}: {e}")
+        return []
+
+async def iter_articles(session, limiters, company, year):
+    """
+    Yield every article for a company/year once, in listing page order, across all listing pages
+    
+    Each article carries its position in that order. Listing pages are only fetched as
+    the consumer asks for more articles, so a consumer that stops early never requests
+    the remaining pages.
+    """
+    page_no = 1
+    next = 0
+    
+    url = URL_TMPL.format(sc=company, p=page_no, n=next, y=year)
+    print(f'URL: {url}')
+    
+    max_page_no, max_next = await get_page_no(session, limiters, url, company, page_no, next, year)
+    max_next = max_next + 1
+    
+    listed = set()
+    for i, j in itertools.product(range(max_next), range(1, max_page_no + 1)):
+        url = URL_TMPL.format(sc=company, p=j, n=i, y=year)
+        
+        for data in await get_listing_articles(session, limiters, url, company, year, j):
+            if data['link'] not in listed:
+                data['position'] = len(listed)
+                listed.add(data['link'])
+                yield data
+
+async def aislice(iterable, stop):
+    """
+    itertools.islice(iterable, stop) for async iterables: yield at most stop items, or all if stop is None
+    """
+    if stop is not None and stop <= 0:
+        return
+    
+    count = 0
+    async for item in iterable:
+        yield item
+        count += 1
+        if count == stop:
+            return
+
+async def listing_worker(session, limiters, listing_queue, article_queue, row_queue, seen, max_articles_per_company=None):
+    """
+    Walk the listing pages of each queued company/year and queue its articles for extraction
+    
+    The first max_articles_per_company articles of each company/year are taken, whether
+    cached or not. Links already in seen (cached by an earlier run or queued earlier in
+    this one) are not fetched again, only linked to the company/year.
+    """
+    while True:
+        company, year = await listing_queue.get()
+        try:
+            print(f"\nProcessing {company} for year {year}")
+            
+            articles = iter_articles(session, limiters, company, year)
+            try:
+                async for data in aislice(articles, max_articles_per_company or None):
+                    if data['link'] in seen:
+                        await row_queue.put(data)
+                    else:
+                        seen.add(data['link'])
+                        await article_queue.put(data)
+            finally:
+                await articles.aclose()
+            
+        except Exception as e:
+            print(f"Error processing listings for {company} in year {year}: {e}")
+        finally:
+            listing_queue.task_done()
+
+async def article_worker(session, limiters, article_queue, row_queue):
+    """
+    Extract the full text of each queued article and hand the finished row to the cache writer
+    """
+    while True:
+        data = await article_queue.get()
+        try:
+            data['full_article'] = await extract_full_article(session, limiters, data['link'])
+            
+            # Network failures stay out of the cache so the next run retries them; a page
+            # that fails to parse would fail again, so it is cached like any other
+            if data['full_article'] == FETCH_ERROR:
+                continue
+            await row_queue.put(data)
+            
+            print(f"Extracted article for {data['company']}: {data['title'][:60]}...")
+            
+        except Exception as e:
+            print(f"Error processing article {data['link']}: {e}")
+        finally:
+            article_queue.task_done()
+
+async def cache_writer(row_queue, conn, run_id):
+    """
+    Store each finished article in the cache as it arrives, committing in batches
+    
+    Rows without full_article are articles fetched before (possibly for another
+    company) and only record that the article is listed for this company/year.
+    Every link is stamped with run_id and its listing position, so the export can
+    pick out exactly the articles listed by this run, in page order.
+    """
+    stored = 0
+    while True:
+        data = await row_queue.get()
+        try:
+            if 'full_article' in data:
+                conn.execute(
+                    "INSERT OR IGNORE INTO articles (url, title, date, summary, full_article) "
+                    "VALUES (:link, :title, :date, :summary, :full_article)",
+                    data
+                )
+            conn.execute(
+                "INSERT INTO article_links (url, company, year, run_id, position) "
+                "VALUES (:link, :company, :year, :run_id, :position) "
+                "ON CONFLICT (url, company, year) DO UPDATE SET "
+                "run_id = excluded.run_id, position = excluded.position",
+                {**data, 'run_id': run_id}
+            )
             
-            # Limit content length to avoid extremely long articles
-            if len(article_content) > 15000:
-                article_content = article_content[:15000] + "... [Content truncated]"
+            stored += 1
+            if stored % CACHE_COMMIT_EVERY == 0:
+                conn.commit()
+        finally:
+            row_queue.task_done()
+
+def open_article_cache(path=CACHE_DB):
+    """
+    Open the SQLite store of already extracted articles, creating it if needed
+    
+    Each article is stored once per URL in articles; article_links records every
+    company/year whose listings include it, along with the run that last listed it.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS articles ("
+        "url TEXT PRIMARY KEY, title TEXT, date TEXT, summary TEXT, full_article TEXT)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS article_links ("
+        "url TEXT, company TEXT, year INTEGER, run_id TEXT, position INTEGER, "
+        "PRIMARY KEY (url, company, year))"
+    )
+    # Caches created before links were tied to a run lack these columns
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(article_links)")}
+    for column, kind in (('run_id', 'TEXT'), ('position', 'INTEGER')):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE article_links ADD COLUMN {column} {kind}")
+    conn.commit()
+    return conn
+
+def export_articles(conn, sc_id, years, run_id, fp):
+    """
+    Write the articles listed by run run_id to fp as CSV, returning length statistics
+    for the exported rows
+    
+    Only this run's links are exported, so the CSV holds the same articles a run
+    without the cache would have collected: at most max_articles_per_company per
+    company/year, whether they were fetched now or taken from the cache. Rows are
+    grouped by company, then year, in listing page order.
+    """
+    rows = itertools.chain.from_iterable(
+        conn.execute(
+            "SELECT l.company, l.year, a.title, a.url, a.date, a.summary, a.full_article "
+            "FROM article_links l JOIN articles a ON a.url = l.url "
+            "WHERE l.company = ? AND l.year = ? AND l.run_id = ? "
+            "ORDER BY l.position",
+            (company, year, run_id)
+        )
+        for company in sc_id
+        for year in years
+    )
+    
+    writer = csv.writer(fp, quoting=csv.QUOTE_MINIMAL)
+    writer.writerow(CSV_FIELDS)
+    
+    stats = {'articles': 0, 'total_length': 0, 'min_length': None, 'max_length': 0, 'sample': None}
+    for row in rows:
+        writer.writerow(row)
         
-        return article_content
+        full_article = row[-1]
+        length = len(full_article)
+        stats['articles'] += 1
+        stats['total_length'] += length
+        stats['min_length'] = length if stats['min_length'] is None else min(stats['min_length'], length)
+        stats['max_length'] = max(stats['max_length'], length)
+        if stats['sample'] is None:
+            stats['sample'] = full_article
+    
+    return stats
+
+async def scrape_company_articles(sc_id, years, conn, run_id, max_articles_per_company=None, requests_per_second=0.5):
+    """
+    Scrape listing pages and full articles as an overlapping producer/consumer pipeline,
+    storing each newly extracted article in the cache connection conn and linking every
+    listed article to run_id
+    """
+    listing_queue = asyncio.Queue()
+    article_queue = asyncio.Queue(maxsize=ARTICLE_QUEUE_SIZE)
+    row_queue = asyncio.Queue()
+    
+    for company in sc_id:
+        for year in years:
+            listing_queue.put_nowait((company, year))
+    
+    # Articles cached by earlier runs are never fetched again
+    seen = {url for (url,) in conn.execute("SELECT url FROM articles")}
+    
+    # Ceiling per host; unlike a fixed sleep, waiting only happens once the budget is spent
+    limiters = host_limiters(requests_per_second)
+    
+    async with create_session() as session:
+        workers = [
+            asyncio.create_task(listing_worker(session, limiters, listing_queue, article_queue, row_queue, seen, max_articles_per_company))
+            for _ in range(LISTING_WORKERS)
+        ]
+        workers += [
+            asyncio.create_task(article_worker(session, limiters, article_queue, row_queue))
+            for _ in range(ARTICLE_WORKERS)
+        ]
+        workers.append(asyncio.create_task(cache_writer(row_queue, conn, run_id)))
         
-    except requests.RequestException as e:
-        print(f"Failed to fetch article {article_url}: {e}")
-        return "Error: Could not fetch article content"
-    except Exception as e:
-        print(f"Error processing article {article_url}: {e}")
-        return "Error: Could not parse article content"
+        try:
+            # Articles keep being queued until every listing is walked, so drain listings first
+            await listing_queue.join()
+            await article_queue.join()
+            await row_queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            
+            # Keep what was already extracted even when interrupted, so the next run resumes from it
+            conn.commit()
 
-def save_company_data_with_full_articles(sc_id, years, max_articles_per_company=None, delay_between_articles=2):
+def save_company_data_with_full_articles(sc_id, years, max_articles_per_company=None, requests_per_second=0.5, as_dataframe=False, cache_path=CACHE_DB):
     """
     Save company data with full article content for given stock codes and years
     
+    Every extracted article is stored in the SQLite cache at cache_path as soon as it
+    is fetched, and articles already there are skipped, so an interrupted run resumes
+    where it stopped. The CSV is exported from the cache once scraping finishes and holds
+    only the articles listed by this run, so repeated runs with the same arguments write
+    the same rows rather than everything the cache has accumulated.
+    
     Parameters:
     - sc_id: List of company stock codes
     - years: List of years to scrape
-    - max_articles_per_company: Maximum articles per company (None for unlimited)
-    - delay_between_articles: Delay in seconds between article requests
+    - max_articles_per_company: Maximum articles per company and year, in listing order, counting cached ones (None for unlimited)
+    - requests_per_second: Maximum request rate to any single host (0.5 matches the old 2 second delay between articles)
+    - as_dataframe: Read the finished CSV back and return a DataFrame instead of the filename
+    - cache_path: SQLite file holding already extracted articles
     """
-    url_ = "https://www.moneycontrol.com/stocks/company_info/stock_news.php?"
-    
-    all_data = []
-    total_articles_processed = 0
+    # Stray whitespace in a stock code would otherwise end up in the listing URL
+    sc_id = [company.strip() for company in sc_id]
     
     print(f"Starting full article scraping for companies: {sc_id}")
     print(f"Years: {years}")
     print(f"Max articles per company: {max_articles_per_company if max_articles_per_company else 'Unlimited'}")
-    print(f"Delay between articles: {delay_between_articles} seconds")
+    print(f"Max requests per second per host: {requests_per_second}")
+    print(f"Article cache: {cache_path}")
     print("=" * 60)
     
-    for company in sc_id:
-        for year in years:
-            print(f"\nProcessing {company} for year {year}")
-            
-            page_no = 1
-            next = 0
-            
-            url = url_ + 'sc_id=' + company + '&scat=&page_no=' + str(page_no) + '&next=' + str(next) + '&durationType=Y&Year=' + str(year) + '&duration=1&news_type='
-            print(f'URL: {url}')
-            
-            max_page_no, max_next = get_page_no(url, company, page_no, next, year)
-            max_next = max_next + 1
-            
-            articles_processed = 0
-            
-            for i in range(max_next):
-                for j in range(1, max_page_no + 1):
-                    try:
-                        url = url_ + 'sc_id=' + company + '&scat=&page_no=' + str(j) + '&next=' + str(i) + '&durationType=Y&Year=' + str(year) + '&duration=1&news_type='
-                        
-                        request = requests.get(url)
-                        request.raise_for_status()
-                        
-                        soup = BeautifulSoup(request.text, 'html.parser')
-                        articles = soup.find_all('div', attrs={'class': 'FL PR20'})
-                        
-                        for article in articles:
-                            # Check if we've reached the limit
-                            if max_articles_per_company and articles_processed >= max_articles_per_company:
-                                print(f"Reached limit of {max_articles_per_company} articles for {company}")
-                                break
-                                
-                            try:
-                                link_element = article.find('a', attrs={'class': 'arial11_summ'})
-                                if not link_element:
-                                    continue
-                                
-                                title = link_element.get('title', '') or link_element.get_text(strip=True)
-                                link = link_element.get('href', 'No link')
-                                
-                                # Skip if no valid link
-                                if link == 'No link' or not link.startswith('http'):
-                                    continue
-                                
-                                articles_processed += 1
-                                total_articles_processed += 1
-                                
-                                print(f"Extracting article {articles_processed} for {company} ({total_articles_processed} total): {title[:60]}...")
-                                
-                                # Extract full article content
-                                full_article = extract_full_article(link)
-                                
-                                # Extract date from the article block
-                                date_element = article.find('span', attrs={'class': 'g_date'})
-                                if date_element:
-                                    date = date_element.get_text(strip=True)
-                                else:
-                                    date = "No date"
-                                
-                                # Try to extract summary from title attribute or link text
-                                summary = link_element.get('title', '') or link_element.get_text(strip=True)
-                                
-                                data = {
-                                    'company': company,
-                                    'year': year,
-                                    'title': title,
-                                    'link': link,
-                                    'date': date,
-                                    'summary': summary,
-                                    'full_article': full_article
-                                }
-                                all_data.append(data)
-                                
-                                # Add delay to be respectful to the server
-                                time.sleep(delay_between_articles)
-                                
-                            except Exception as e:
-                                print(f"Error processing article for {company} in year {year}: {e}")
-                                continue
-                        
-                        # Break outer loop if we've reached the limit
-                        if max_articles_per_company and articles_processed >= max_articles_per_company:
-                            break
-                            
-                        # Add delay between pages
-                        time.sleep(1)
-                        
-                    except requests.RequestException as e:
-                        print(f"Request failed for {company} year {year} page {j}: {e}")
-                        continue
-                    except Exception as e:
-                        print(f"Error processing {company} year {year} page {j}: {e}")
-                        continue
-                
-                # Break outer loop if we've reached the limit
-                if max_articles_per_company and articles_processed >= max_articles_per_company:
-                    break
-    
-    # Save to DataFrame and CSV
-    if all_data:
-        df = pd.DataFrame(all_data)
+    conn = open_article_cache(cache_path)
+    run_id = uuid.uuid4().hex
+    try:
+        cached_before = conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        asyncio.run(scrape_company_articles(sc_id, years, conn, run_id, max_articles_per_company, requests_per_second))
+        cached_after = conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        print(f"\nNew articles fetched this run: {cached_after - cached_before}")
         
         # Create filename with timestamp
-        from datetime import datetime
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"company_news_full_articles_{'_'.join(sc_id)}_{'_'.join(map(str, years))}_{timestamp}.csv"
         
         # Save with UTF-8 encoding
-        df.to_csv(filename, index=False, encoding='utf-8')
-        
-        print(f"\n" + "=" * 60)
-        print(f"SCRAPING COMPLETED!")
-        print(f"Data saved to: {filename}")
-        print(f"Total articles collected: {len(all_data)}")
-        print(f"File size: {os.path.getsize(filename) / (1024*1024):.2f} MB")
-        
-        # Show sample statistics
-        if not df.empty:
-            print(f"\nSample statistics:")
-            print(f"- Average article length: {df['full_article'].str.len().mean():.0f} characters")
-            print(f"- Shortest article: {df['full_article'].str.len().min()} characters")
-            print(f"- Longest article: {df['full_article'].str.len().max()} characters")
-            
-            print(f"\nSample article preview:")
-            sample_article = df.iloc[0]['full_article']
-            print(f"Length: {len(sample_article)} characters")
-            print(f"Preview: {sample_article[:300]}...")
-        
-        return df
-    else:
+        with open(filename, 'w', newline='', encoding='utf-8') as fp:
+            stats = export_articles(conn, sc_id, years, run_id, fp)
+    finally:
+        conn.close()
+    
+    if not stats['articles']:
+        os.remove(filename)
         print("No data collected")
         return None
+    
+    print(f"\n" + "=" * 60)
+    print(f"SCRAPING COMPLETED!")
+    print(f"Data saved to: {filename}")
+    print(f"Total articles collected: {stats['articles']}")
+    print(f"File size: {os.path.getsize(filename) / (1024*1024):.2f} MB")
+    
+    # Show sample statistics
+    print(f"\nSample statistics:")
+    print(f"- Average article length: {stats['total_length'] / stats['articles']:.0f} characters")
+    print(f"- Shortest article: {stats['min_length']} characters")
+    print(f"- Longest article: {stats['max_length']} characters")
+    
+    print(f"\nSample article preview:")
+    sample_article = stats['sample']
+    print(f"Length: {len(sample_article)} characters")
+    print(f"Preview: {sample_article[:300]}...")
+    
+    if as_dataframe:
+        import pandas as pd
+        return pd.read_csv(filename, encoding='utf-8')
+    return filename
 
 # Example usage
 if __name__ == "__main__":
@@ -289,7 +732,7 @@ if __name__ == "__main__":
     #     sc_id=['RI'], 
     #     years=[2025], 
     #     max_articles_per_company=None,
-    #     delay_between_articles=1
+    #     requests_per_second=1
     # )
     
     # Example 2: Full scraping (uncomment to use)
@@ -302,7 +745,7 @@ if __name__ == "__main__":
     'KMB',   # Kotak Mahindra Bank
     'AB16',   # Axis Bank
     'BOB',    # Bank of Baroda    
-    'PNB05 ',      # Punjab National Bank
+    'PNB05',      # Punjab National Bank
     'UBI01',    # Union Bank of India
     'CB06',   # Canara Bank
     'IIB',   # IndusInd Bank
@@ -323,5 +766,5 @@ if __name__ == "__main__":
 , 
         years=[2025], 
         max_articles_per_company=None,  # Unlimited
-        delay_between_articles=2
+        requests_per_second=0.5
     ) 
\ No newline at end of file
@@ -0,0 +1,27 @@
+import asyncio
+import unittest
+
+from final_full_article_scraper import AsyncLimiter
+
+class AsyncLimiterTest(unittest.IsolatedAsyncioTestCase):
+    async def test_fractional_rate_keeps_handing_out_tokens(self):
+        # 0.5 requests per 0.1s: one token up front, then one every 0.2s
+        limiter = AsyncLimiter(0.5, 0.1)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(3):
+            await asyncio.wait_for(limiter.acquire(), timeout=2)
+        self.assertGreaterEqual(loop.time() - start, 0.35)
+        
+    async def test_burst_up_to_rate_then_waits(self):
+        limiter = AsyncLimiter(3, 0.3)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(3):
+            await asyncio.wait_for(limiter.acquire(), timeout=2)
+        self.assertLess(loop.time() - start, 0.05)
+        await asyncio.wait_for(limiter.acquire(), timeout=2)
+        self.assertGreaterEqual(loop.time() - start, 0.09)
+
+if __name__ == '__main__':
+    unittest.main()